@@ -0,0 +1,109 @@
+"""
+Compare document search layouts: full vectors vs. halfvec and binary
+first-pass search with full-vector re-ranking. Only the compact copies
+enabled in settings (DOCUMENT_STORE_HALF / DOCUMENT_STORE_BINARY) are
+measured.
+
+Reports on-disk size of each representation and its index, query latency
+and recall@k against exact full-precision search. Queries are embeddings
+of randomly sampled documents with a little noise added.
+
+Usage:
+    python -m benchmarks.document_search --queries 200 --k 10 --candidates 100
+"""
+import argparse
+import random
+import statistics
+import time
+from sqlalchemy import func, select, text
+from db.database import SessionLocal
+from models.embedding import Document
+from services.document_service import SEARCH_MODES, search_documents
+
+MODE_COLUMNS = {
+    "full": "embedding",
+    "half": "embedding_half",
+    "binary": "embedding_bit",
+}
+
+INDEX_SIZE_QUERY = """
+SELECT indexrelname, pg_relation_size(indexrelid)
+FROM pg_stat_user_indexes
+WHERE relname = 'documents'
+"""
+
+
+def exact_neighbours(db, query_embedding, k):
+    """Ground truth: exhaustive search over the full vectors"""
+    db.execute(text("SET LOCAL enable_indexscan = off"))
+    distance = Document.embedding.cosine_distance(query_embedding)
+    ids = db.execute(select(Document.id).order_by(distance).limit(k)).scalars().all()
+    db.rollback()
+    return set(ids)
+
+
+def sample_queries(db, count, noise):
+    embeddings = db.execute(
+        select(Document.embedding)
+        .where(Document.embedding.isnot(None))
+        .order_by(func.random())
+        .limit(count)
+    ).scalars().all()
+    return [
+        [value + random.gauss(0, noise) for value in embedding]
+        for embedding in embeddings
+    ]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--candidates", type=int, default=100)
+    parser.add_argument("--noise", type=float, default=0.01)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rows = db.execute(select(func.count(Document.id))).scalar()
+        sizes = db.execute(text("SELECT " + ", ".join(
+            f"avg(pg_column_size({MODE_COLUMNS[mode]}))" for mode in SEARCH_MODES
+        ) + " FROM documents")).one()
+        index_sizes = db.execute(text(INDEX_SIZE_QUERY)).all()
+        db.rollback()
+
+        print(f"documents: {rows}")
+        print("bytes per row: " + " ".join(
+            f"{mode}={size or 0:.0f}" for mode, size in zip(SEARCH_MODES, sizes)))
+        for name, size in index_sizes:
+            print(f"index {name}: {size / 1024 / 1024:.1f} MiB")
+
+        queries = sample_queries(db, args.queries, args.noise)
+        db.rollback()
+        truth = [exact_neighbours(db, query, args.k) for query in queries]
+
+        print(f"\n{'mode':<8}{'p50 ms':>10}{'p95 ms':>10}{'recall@' + str(args.k):>12}")
+        for mode in SEARCH_MODES:
+            latencies = []
+            recalls = []
+            for query, expected in zip(queries, truth):
+                start = time.perf_counter()
+                results = search_documents(
+                    query, db, k=args.k, mode=mode, candidates=args.candidates)
+                latencies.append((time.perf_counter() - start) * 1000)
+                db.rollback()
+                recalls.append(len({row.id for row in results} & expected) / len(expected))
+
+            print(f"{mode:<8}{percentile(latencies, 50):>10.2f}"
+                  f"{percentile(latencies, 95):>10.2f}{statistics.mean(recalls):>12.3f}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
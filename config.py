@@ -11,9 +11,47 @@ class Settings(BaseSettings):
         "SECRET_KEY", "your-secret-key-change-in-production")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: int = 30
     APP_NAME: str = "Chat Application"
     DEBUG: bool = True
 
+    # Long-term memory indexing
+    MEMORY_ENABLED: bool = False
+    MEMORY_WORKERS: int = 2
+    MEMORY_BATCH_SIZE: int = 32
+    MEMORY_MAX_ATTEMPTS: int = 5
+    MEMORY_SWEEP_SECONDS: int = 30
+    MEMORY_TOP_K: int = 5
+    MEMORY_QUERY_TIMEOUT_SECONDS: float = 2
+    MEMORY_MAX_CHARS: int = 8000
+    EMBEDDING_MODEL: str = "text-embedding-3-small"
+
+    # Document search: 'full', 'half' (halfvec) or 'binary' (bit) first pass.
+    # Each compact copy (column and index) is only stored when enabled, and
+    # the search mode must use one that is
+    DOCUMENT_STORE_HALF: bool = True
+    DOCUMENT_STORE_BINARY: bool = False
+    DOCUMENT_SEARCH_MODE: str = "half"
+    DOCUMENT_RERANK_CANDIDATES: int = 100
+
+    # WebSocket chat
+    WS_HEARTBEAT_SECONDS: int = 20
+    WS_IDLE_TIMEOUT_SECONDS: int = 300
+    WS_SEND_QUEUE_SIZE: int = 64
+
+    # Admission control
+    RATE_LIMIT_PER_MINUTE: int = 120
+    RATE_LIMIT_BURST: int = 30
+    ADMISSION_MIN_CONCURRENCY: int = 4
+    ADMISSION_MAX_CONCURRENCY: int = 64
+    ADMISSION_TARGET_P95_MS: float = 2000
+    # Logins pay for bcrypt; chat turns wait on the model
+    ADMISSION_AUTH_MAX_CONCURRENCY: int = 16
+    ADMISSION_AUTH_TARGET_P95_MS: float = 3000
+    ADMISSION_CHAT_MAX_CONCURRENCY: int = 32
+    ADMISSION_CHAT_TARGET_P95_MS: float = 30000
+
     # Add these fields
     OPENAI_API_KEY: str
     POSTGRES_USER: str
@@ -0,0 +1,128 @@
+"""
+Add and backfill the conversation summary columns
+(message_count, last_message_at, last_message_preview).
+
+Safe to re-run, and safe to run while the app is serving traffic: schema
+changes run in their own short transactions, indexes are built
+concurrently, and summaries are recomputed in batches of conversations.
+Usage:
+    python -m db.backfill_conversation_summaries
+"""
+from sqlalchemy import text
+from db.database import engine
+from models.chat import PREVIEW_LENGTH, TITLE_MAX_LENGTH
+
+BATCH_SIZE = 1000
+
+# Give up instead of queueing behind long transactions: a waiting ALTER
+# blocks every later query on the table
+LOCK_TIMEOUT = "SET LOCAL lock_timeout = '5s'"
+
+# Titles are INCLUDEd in the covering index, so they need a length cap
+CAP_TITLES = f"""
+UPDATE chat_conversations
+SET title = left(title, {TITLE_MAX_LENGTH})
+WHERE length(title) > {TITLE_MAX_LENGTH}
+"""
+
+ALTER_TITLE = f"""
+ALTER TABLE chat_conversations
+    ALTER COLUMN title TYPE VARCHAR({TITLE_MAX_LENGTH})
+"""
+
+ADD_COLUMNS = f"""
+ALTER TABLE chat_conversations
+    ADD COLUMN IF NOT EXISTS message_count INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS last_message_at TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS last_message_preview VARCHAR({PREVIEW_LENGTH + 3})
+"""
+
+CREATE_INDEXES = [
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chat_messages_conversation_id_created_at
+        ON chat_messages (conversation_id, created_at)
+    """,
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_chat_conversations_user_id_updated_at
+        ON chat_conversations (user_id, updated_at DESC)
+        INCLUDE (id, title, created_at, message_count, last_message_at, last_message_preview)
+    """,
+]
+
+# Locked in its own statement so the recompute below takes a fresh snapshot
+# that includes turns which committed while we waited for the locks
+LOCK_BATCH = """
+SELECT id::text
+FROM chat_conversations
+WHERE id > CAST(:after AS uuid)
+ORDER BY id
+LIMIT :batch_size
+FOR UPDATE
+"""
+
+BACKFILL_BATCH = """
+UPDATE chat_conversations AS c
+SET message_count = s.message_count,
+    last_message_at = l.created_at,
+    last_message_preview = CASE
+        WHEN length(l.content) > :preview_length
+        THEN left(l.content, :preview_length) || '...'
+        ELSE l.content
+    END
+FROM unnest(CAST(:ids AS uuid[])) AS b(id)
+CROSS JOIN LATERAL (
+    SELECT count(*) AS message_count
+    FROM chat_messages AS m
+    WHERE m.conversation_id = b.id
+) AS s
+LEFT JOIN LATERAL (
+    SELECT m.created_at, m.content
+    FROM chat_messages AS m
+    WHERE m.conversation_id = b.id
+    ORDER BY m.created_at DESC
+    LIMIT 1
+) AS l ON true
+WHERE c.id = b.id
+"""
+
+
+def prepare_schema():
+    """Cap titles and add the summary columns and indexes"""
+    with engine.begin() as conn:
+        conn.execute(text(CAP_TITLES))
+
+    for statement in (ALTER_TITLE, ADD_COLUMNS):
+        with engine.begin() as conn:
+            conn.execute(text(LOCK_TIMEOUT))
+            conn.execute(text(statement))
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for statement in CREATE_INDEXES:
+            conn.execute(text(statement))
+
+
+def backfill_conversation_summaries(batch_size: int = BATCH_SIZE) -> int:
+    """Recompute the summary columns from chat_messages, batch by batch"""
+    prepare_schema()
+
+    total = 0
+    after = "00000000-0000-0000-0000-000000000000"
+    while True:
+        with engine.begin() as conn:
+            ids = conn.execute(
+                text(LOCK_BATCH), {"after": after, "batch_size": batch_size}
+            ).scalars().all()
+            if not ids:
+                break
+            conn.execute(
+                text(BACKFILL_BATCH), {"ids": ids, "preview_length": PREVIEW_LENGTH})
+
+        total += len(ids)
+        after = ids[-1]
+
+    return total
+
+
+if __name__ == "__main__":
+    print(f"Backfilled {backfill_conversation_summaries()} conversations")
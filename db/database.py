@@ -1,9 +1,16 @@
 import os
+import itertools
+import logging
+import threading
+from typing import Optional
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from fastapi import Request
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 
+logger = logging.getLogger(__name__)
+
 # Load .env file
 load_dotenv()
 Base = declarative_base()
@@ -14,6 +21,13 @@ DB_NAME = os.getenv("POSTGRES_DB")
 DB_HOST = os.getenv("POSTGRES_HOST", "localhost")
 DB_PORT = os.getenv("POSTGRES_PORT", "5432")
 
+# Comma-separated URLs of streaming replicas used for read-only requests
+REPLICA_URLS = [
+    url.strip() for url in os.getenv("POSTGRES_REPLICA_URLS", "").split(",") if url.strip()
+]
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_HEALTH_CHECK_SECONDS = float(os.getenv("REPLICA_HEALTH_CHECK_SECONDS", "5"))
+
 # Construct database URL
 DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 print(DATABASE_URL)
@@ -23,8 +37,202 @@ engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-def get_db():
-    db = SessionLocal()
+# Header carrying the primary WAL position of a client's latest write
+LAST_WRITE_LSN_HEADER = "X-Last-Write-LSN"
+# Marker no replica can reach; reads carrying it always use the primary
+PRIMARY_ONLY_LSN = "FFFFFFFF/FFFFFFFF"
+
+
+def parse_lsn(lsn: Optional[str]) -> Optional[int]:
+    """Convert a Postgres LSN such as '16/B374D848' to an integer"""
+    if not lsn:
+        return None
+    try:
+        high, _, low = lsn.strip().partition("/")
+        return (int(high, 16) << 32) + int(low, 16)
+    except ValueError:
+        return None
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_bulk_write(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_begin")
+def _remember_connection(session, transaction, connection):
+    session.info["connection"] = connection
+
+
+@event.listens_for(Session, "after_commit")
+def _record_commit(session):
+    # Runs before the response is sent, so the client always gets the marker
+    connection = session.info.pop("connection", None)
+    if not session.info.pop("wrote", False) or not replica_router.engines:
+        return
+
+    # The session still holds its connection here, so read the position on
+    # it rather than checking out a second one from the pool. It is read
+    # after the commit so that it covers the commit record.
+    try:
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute("SELECT pg_current_wal_lsn()::text")
+            lsn = cursor.fetchone()[0]
+        finally:
+            cursor.close()
+    except Exception:
+        # Without the real position, pin the client's reads to the primary
+        # until its next write rather than leave it with an older marker
+        logger.error("Could not read the primary WAL position; "
+                     "routing the client's reads to the primary", exc_info=True)
+        lsn = PRIMARY_ONLY_LSN
+
+    session.info["last_write_lsn"] = lsn
+    request_state = session.info.get("request_state")
+    if request_state is not None:
+        request_state["last_write_lsn"] = lsn
+
+
+class ReplicaRouter:
+    """
+    Picks a replica engine for read-only sessions.
+
+    A background thread polls every replica for its replay position and lag.
+    Replicas that are unreachable, not streaming from the primary, or lag
+    more than max_lag seconds are skipped, and reads fall back to the
+    primary when none is usable.
+
+    Read-your-writes is driven by the client: responses to writes carry the
+    primary WAL position in X-Last-Write-LSN, and a read that sends it back
+    only goes to a replica that has replayed at least that far. This holds
+    across workers and instances.
+    """
+
+    def __init__(
+        self,
+        urls,
+        max_lag: float = REPLICA_MAX_LAG_SECONDS,
+        check_interval: float = REPLICA_HEALTH_CHECK_SECONDS
+    ):
+        self.engines = [create_engine(url, pool_pre_ping=True) for url in urls]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        # (engine, replayed LSN) pairs; replicas start out unusable until
+        # their first health check passes
+        self._healthy = []
+        self._round_robin = itertools.count()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start health checking"""
+        if not self.engines or self._thread:
+            return
+        self._stop.clear()
+        self.check_replicas()
+        self._thread = threading.Thread(
+            target=self._run, name="replica-health", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop health checking"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(self.check_interval)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.check_interval):
+            self.check_replicas()
+
+    def check_replicas(self):
+        """Refresh the list of replicas that are streaming and within max_lag"""
+        healthy = []
+        for replica in self.engines:
+            try:
+                with replica.connect() as conn:
+                    in_recovery, receiver_status, replay_lsn, lag = conn.execute(text(
+                        "SELECT pg_is_in_recovery(), "
+                        "(SELECT status FROM pg_stat_wal_receiver), "
+                        "pg_last_wal_replay_lsn()::text, "
+                        "CASE "
+                        "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                        "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) "
+                        "END"
+                    )).one()
+            except Exception:
+                logger.warning("Replica %s is unreachable", replica.url, exc_info=True)
+                continue
+
+            # Caught up only means something while the WAL receiver is connected
+            if not in_recovery or receiver_status != "streaming":
+                logger.warning("Replica %s is not streaming (%s)", replica.url, receiver_status)
+            elif lag is None or lag > self.max_lag:
+                logger.warning("Replica %s lags %s seconds", replica.url, lag)
+            else:
+                healthy.append((replica, parse_lsn(replay_lsn)))
+
+        self._healthy = healthy
+
+    def engine_for_read(self, min_lsn: Optional[str] = None):
+        """Return a replica that has replayed min_lsn, or the primary"""
+        required = parse_lsn(min_lsn)
+        candidates = [
+            replica for replica, replayed in self._healthy
+            if required is None or (replayed is not None and replayed >= required)
+        ]
+        if not candidates:
+            return engine
+
+        return candidates[next(self._round_robin) % len(candidates)]
+
+
+replica_router = ReplicaRouter(REPLICA_URLS)
+
+
+class LastWriteLSNMiddleware:
+    """Adds X-Last-Write-LSN to responses of requests that wrote to the primary"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not replica_router.engines:
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+
+        async def send_with_lsn(message):
+            if message["type"] == "http.response.start" and state.get("last_write_lsn"):
+                message["headers"] = list(message.get("headers", [])) + [(
+                    LAST_WRITE_LSN_HEADER.lower().encode("latin-1"),
+                    state["last_write_lsn"].encode("latin-1")
+                )]
+            await send(message)
+
+        await self.app(scope, receive, send_with_lsn)
+
+
+def get_db(request: Request):
+    db = SessionLocal(info={"request_state": request.scope.setdefault("state", {})})
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request):
+    """Session for read-only endpoints, routed to a replica when possible"""
+    min_lsn = request.headers.get(LAST_WRITE_LSN_HEADER)
+    db = SessionLocal(bind=replica_router.engine_for_read(min_lsn))
     try:
         yield db
     finally:
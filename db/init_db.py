@@ -1,5 +1,20 @@
+from sqlalchemy import text
 from db.database import engine, Base
+import models.user  # noqa: F401
+import models.chat  # noqa: F401
+import models.refresh_token  # noqa: F401
+import models.course  # noqa: F401
+import models.memory  # noqa: F401
+import models.embedding  # noqa: F401
+
+
+def create_extensions():
+    """Create the Postgres extensions the models depend on"""
+    # pgvector: message_embeddings (long-term memory) and documents
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
 
 
 def init_db():
+    create_extensions()
     Base.metadata.create_all(bind=engine)
@@ -0,0 +1,133 @@
+"""
+Load scraper output into the courses and professors tables.
+
+Usage:
+    python -m db.load_catalog scrapping/neu_courses.json scrapping/neu_professors_stream.jsonl
+"""
+import json
+import re
+import sys
+from typing import Optional
+from sqlalchemy.dialects.postgresql import insert
+from db.database import SessionLocal
+from db.init_db import init_db
+from models.course import Course, Professor
+
+# Catalog titles look like 'CS 5800.  Algorithms.  (4 Hours)'
+COURSE_TITLE_PATTERN = re.compile(
+    r"^\s*([A-Z]{2,4})\s+(\d{4})\.\s*(.*?)\.?\s*(?:\(([\d.\-–]+)\s+Hours?\))?\s*$"
+)
+
+
+def parse_course(record: dict) -> Optional[dict]:
+    """Convert a scraped course record into a courses row"""
+    title = record.get("title", "").replace("\xa0", " ")
+    match = COURSE_TITLE_PATTERN.match(title)
+    if not match:
+        return None
+
+    subject, number, name, credits = match.groups()
+    description = record.get("description")
+    return {
+        "subject": subject,
+        "number": number,
+        "title": name.strip(),
+        "description": None if description == "N/A" else description,
+        "credits": credits.replace("–", "-") if credits else None,
+        "extras": record.get("extras") or [],
+    }
+
+
+def parse_professor(record: dict) -> Optional[dict]:
+    """Convert a scraped professor record into a professors row"""
+    name = (record.get("name") or "").strip()
+    if not name:
+        return None
+
+    try:
+        rating = float(record.get("rating"))
+    except (TypeError, ValueError):
+        rating = None
+
+    return {
+        "name": name,
+        "department": record.get("department") or None,
+        "rating": rating,
+        "num_reviews": len(record.get("reviews") or []),
+        "url": record.get("url"),
+    }
+
+
+def load_courses(path: str, db) -> int:
+    """Upsert courses from the catalog scraper's JSON file"""
+    with open(path, "r", encoding="utf-8") as f:
+        records = json.load(f)
+
+    rows = {}
+    for record in records:
+        row = parse_course(record)
+        if row:
+            rows[(row["subject"], row["number"])] = row
+
+    if not rows:
+        return 0
+
+    stmt = insert(Course).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Course.subject, Course.number],
+        set_={
+            "title": stmt.excluded.title,
+            "description": stmt.excluded.description,
+            "credits": stmt.excluded.credits,
+            "extras": stmt.excluded.extras,
+        }
+    )
+    db.execute(stmt)
+    db.commit()
+
+    return len(rows)
+
+
+def load_professors(path: str, db) -> int:
+    """Upsert professors from the RateMyProfessors JSONL stream"""
+    rows = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = parse_professor(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+            if row:
+                rows[row["url"] or row["name"]] = row
+
+    if not rows:
+        return 0
+
+    stmt = insert(Professor).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Professor.url],
+        set_={
+            "name": stmt.excluded.name,
+            "department": stmt.excluded.department,
+            "rating": stmt.excluded.rating,
+            "num_reviews": stmt.excluded.num_reviews,
+        }
+    )
+    db.execute(stmt)
+    db.commit()
+
+    return len(rows)
+
+
+if __name__ == "__main__":
+    courses_path = sys.argv[1] if len(sys.argv) > 1 else "scrapping/neu_courses.json"
+    professors_path = sys.argv[2] if len(sys.argv) > 2 else None
+
+    init_db()
+    db = SessionLocal()
+    try:
+        print(f"Loaded {load_courses(courses_path, db)} courses")
+        if professors_path:
+            print(f"Loaded {load_professors(professors_path, db)} professors")
+    finally:
+        db.close()
@@ -0,0 +1,25 @@
+"""
+Delete expired refresh tokens of all users.
+
+Login and refresh already purge the current user's expired tokens; run
+this periodically (e.g. daily from cron) for users who stopped signing in.
+Usage:
+    python -m db.purge_refresh_tokens
+"""
+from db.database import SessionLocal
+import db.init_db  # noqa: F401  registers every model for the mappers
+from services.auth_service import purge_expired_refresh_tokens
+
+
+def purge_refresh_tokens() -> int:
+    db = SessionLocal()
+    try:
+        deleted = purge_expired_refresh_tokens(db)
+        db.commit()
+        return deleted
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    print(f"Deleted {purge_refresh_tokens()} expired refresh tokens")
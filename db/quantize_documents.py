@@ -0,0 +1,65 @@
+"""
+Add and backfill the compact embedding copies on documents that are
+enabled in settings (DOCUMENT_STORE_HALF -> embedding_half,
+DOCUMENT_STORE_BINARY -> embedding_bit), with their HNSW indexes.
+
+Safe to re-run. Usage:
+    python -m db.quantize_documents
+"""
+from sqlalchemy import text
+from config import settings
+from db.database import engine
+from models.embedding import EMBEDDING_DIMENSIONS
+
+HALF = {
+    "column": "embedding_half",
+    "add": f"ADD COLUMN IF NOT EXISTS embedding_half HALFVEC({EMBEDDING_DIMENSIONS})",
+    "value": f"embedding::halfvec({EMBEDDING_DIMENSIONS})",
+    "index": """
+    CREATE INDEX IF NOT EXISTS ix_documents_embedding_half_hnsw
+        ON documents USING hnsw (embedding_half halfvec_cosine_ops)
+    """,
+}
+
+BINARY = {
+    "column": "embedding_bit",
+    "add": f"ADD COLUMN IF NOT EXISTS embedding_bit BIT({EMBEDDING_DIMENSIONS})",
+    "value": f"binary_quantize(embedding)::bit({EMBEDDING_DIMENSIONS})",
+    "index": """
+    CREATE INDEX IF NOT EXISTS ix_documents_embedding_bit_hnsw
+        ON documents USING hnsw (embedding_bit bit_hamming_ops)
+    """,
+}
+
+
+def enabled_copies() -> list:
+    copies = []
+    if settings.DOCUMENT_STORE_HALF:
+        copies.append(HALF)
+    if settings.DOCUMENT_STORE_BINARY:
+        copies.append(BINARY)
+    return copies
+
+
+def quantize_documents() -> int:
+    """Fill the enabled compact embedding columns from the full vectors"""
+    copies = enabled_copies()
+    if not copies:
+        return 0
+
+    assignments = ", ".join(f"{copy['column']} = {copy['value']}" for copy in copies)
+    missing = " OR ".join(f"{copy['column']} IS NULL" for copy in copies)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "ALTER TABLE documents " + ", ".join(copy["add"] for copy in copies)))
+        result = conn.execute(text(
+            f"UPDATE documents SET {assignments} "
+            f"WHERE embedding IS NOT NULL AND ({missing})"))
+        for copy in copies:
+            conn.execute(text(copy["index"]))
+
+    return result.rowcount
+
+
+if __name__ == "__main__":
+    print(f"Quantized {quantize_documents()} documents")
@@ -0,0 +1,5 @@
+#!/bin/bash
+# Allow the replica container to stream WAL from the primary.
+# Runs once, when the primary's data directory is first initialized.
+set -e
+echo "host replication ${POSTGRES_USER} all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -2,7 +2,7 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from db.database import get_db
+from db.database import get_db, get_read_db
 from utils.security import decode_access_token
 from services.user_service import get_user_by_email
 
@@ -10,11 +10,8 @@ from services.user_service import get_user_by_email
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-):
-    """Get current authenticated user"""
+def _authenticate(token: str, db: Session):
+    """Resolve a bearer token to its user"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -34,3 +31,19 @@ async def get_current_user(
         raise credentials_exception
 
     return user
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    """Get current authenticated user"""
+    return _authenticate(token, db)
+
+
+async def get_current_user_read(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_read_db)
+):
+    """Get current authenticated user for read-only endpoints (may use a replica)"""
+    return _authenticate(token, db)
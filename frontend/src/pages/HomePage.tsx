@@ -53,6 +53,7 @@ export default function HomePage() {
   const [editTitle, setEditTitle] = useState("");
   const [sidebarOpen, setSidebarOpen] = useState(true);
   const messagesEndRef = useRef<HTMLDivElement>(null);
+  const refreshPromise = useRef<Promise<boolean> | null>(null);
 
   useEffect(() => {
     loadUser();
@@ -71,7 +72,44 @@ export default function HomePage() {
     return localStorage.getItem("token");
   };
 
-  const apiFetch = async (url: string, options: RequestInit = {}) => {
+  const refreshAccessToken = () => {
+    // Concurrent 401s share one refresh so the token is rotated only once
+    if (!refreshPromise.current) {
+      refreshPromise.current = doRefreshAccessToken().finally(() => {
+        refreshPromise.current = null;
+      });
+    }
+    return refreshPromise.current;
+  };
+
+  const doRefreshAccessToken = async () => {
+    const refreshToken = localStorage.getItem("refresh_token");
+    if (!refreshToken) {
+      return false;
+    }
+
+    const response = await fetch(`${API_BASE_URL}/auth/refresh`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ refresh_token: refreshToken }),
+    });
+
+    if (!response.ok) {
+      localStorage.removeItem("refresh_token");
+      return false;
+    }
+
+    const data = await response.json();
+    localStorage.setItem("token", data.access_token);
+    localStorage.setItem("refresh_token", data.refresh_token);
+    return true;
+  };
+
+  const apiFetch = async (
+    url: string,
+    options: RequestInit = {},
+    retry = true
+  ): Promise<any> => {
     const headers: HeadersInit = {
       "Content-Type": "application/json",
       ...options.headers,
@@ -82,11 +120,27 @@ export default function HomePage() {
       headers["Authorization"] = `Bearer ${token}`;
     }
 
+    // Ask the server to read from a replica only once it has our last write
+    const lastWriteLsn = localStorage.getItem("last_write_lsn");
+    if (lastWriteLsn) {
+      headers["X-Last-Write-LSN"] = lastWriteLsn;
+    }
+
     const response = await fetch(`${API_BASE_URL}${url}`, {
       ...options,
       headers,
     });
 
+    const writeLsn = response.headers.get("X-Last-Write-LSN");
+    if (writeLsn) {
+      localStorage.setItem("last_write_lsn", writeLsn);
+    }
+
+    // Renew an expired access token once instead of forcing a new login
+    if (response.status === 401 && retry && (await refreshAccessToken())) {
+      return apiFetch(url, options, false);
+    }
+
     if (!response.ok) {
       const error = await response
         .json()
@@ -210,7 +264,16 @@ export default function HomePage() {
   };
 
   const handleLogout = () => {
+    const refreshToken = localStorage.getItem("refresh_token");
+    if (refreshToken) {
+      fetch(`${API_BASE_URL}/auth/logout`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ refresh_token: refreshToken }),
+      }).catch(() => {});
+    }
     localStorage.removeItem("token");
+    localStorage.removeItem("refresh_token");
     window.location.href = "/login";
   };
 
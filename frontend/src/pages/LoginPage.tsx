@@ -48,6 +48,11 @@ export default function LoginPage() {
 
         const data = await response.json();
         localStorage.setItem("token", data.access_token);
+        localStorage.setItem("refresh_token", data.refresh_token);
+        const writeLsn = response.headers.get("X-Last-Write-LSN");
+        if (writeLsn) {
+          localStorage.setItem("last_write_lsn", writeLsn);
+        }
         doNavigate("/home");
       } else {
         const registerResponse = await fetch(`${API_BASE_URL}/auth/register`, {
@@ -81,6 +86,11 @@ export default function LoginPage() {
 
         const data = await loginResponse.json();
         localStorage.setItem("token", data.access_token);
+        localStorage.setItem("refresh_token", data.refresh_token);
+        const writeLsn = loginResponse.headers.get("X-Last-Write-LSN");
+        if (writeLsn) {
+          localStorage.setItem("last_write_lsn", writeLsn);
+        }
         doNavigate("/home");
       }
     } catch (err) {
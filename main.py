@@ -1,14 +1,38 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from config import settings
-from router import auth_router, users_router, chat_router
+from router import auth_router, users_router, chat_router, catalog_router, ws_router
+from db.database import replica_router, LastWriteLSNMiddleware, LAST_WRITE_LSN_HEADER
+from services.memory_service import memory_indexer
+from utils.admission_control import AdmissionControlMiddleware, render_metrics
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background workers"""
+    replica_router.start()
+    if settings.MEMORY_ENABLED:
+        memory_indexer.start()
+    yield
+    memory_indexer.stop()
+    replica_router.stop()
+
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan
 )
 
+# Read-your-writes marker for replica routing
+app.add_middleware(LastWriteLSNMiddleware)
+
+# Rate limiting and load shedding (added first so CORS headers wrap rejections)
+app.add_middleware(AdmissionControlMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -16,12 +40,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[LAST_WRITE_LSN_HEADER],
 )
 
 # Include routers
 app.include_router(auth_router.router)
 app.include_router(users_router.router)
 app.include_router(chat_router.router)
+app.include_router(catalog_router.router)
+app.include_router(ws_router.router)
 
 
 @app.get("/")
@@ -38,3 +65,9 @@ def root():
 def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Admission control metrics in Prometheus text format"""
+    return render_metrics()
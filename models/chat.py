@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from db.database import Base
@@ -7,6 +7,12 @@ import uuid
 from sqlalchemy.dialects.postgresql import UUID
 
 
+# Titles and previews are stored in the covering index below, so they must
+# stay well under the btree tuple limit (~2.7 KB)
+TITLE_MAX_LENGTH = 200
+PREVIEW_LENGTH = 100
+
+
 class ChatConversation(Base):
     """Chat conversation model"""
     __tablename__ = "chat_conversations"
@@ -23,18 +29,40 @@ class ChatConversation(Base):
         ForeignKey("users.id"),
         nullable=False
     )
-    title = Column(String, default="New Chat")
+    title = Column(String(TITLE_MAX_LENGTH), default="New Chat")
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow,
                         server_default=func.now(), nullable=False)
 
     updated_at = Column(DateTime(timezone=True), default=datetime.utcnow,
                         onupdate=datetime.utcnow, server_default=func.now(), nullable=False)
 
+    # Summary fields, maintained by every write that adds messages
+    message_count = Column(Integer, default=0, server_default="0", nullable=False)
+    last_message_at = Column(DateTime(timezone=True), nullable=True)
+    last_message_preview = Column(String(PREVIEW_LENGTH + 3), nullable=True)
+
     # Relationships
     messages = relationship(
         "ChatMessage", back_populates="conversation", cascade="all, delete-orphan")
     user = relationship("User", back_populates="conversations")
 
+    __table_args__ = (
+        # Covers the sidebar listing so it is served by an index-only scan
+        Index(
+            "ix_chat_conversations_user_id_updated_at",
+            "user_id",
+            updated_at.desc(),
+            postgresql_include=[
+                "id",
+                "title",
+                "created_at",
+                "message_count",
+                "last_message_at",
+                "last_message_preview"
+            ]
+        ),
+    )
+
 
 class ChatMessage(Base):
     """Chat message model"""
@@ -59,3 +87,8 @@ class ChatMessage(Base):
 
     # Relationships
     conversation = relationship("ChatConversation", back_populates="messages")
+
+    __table_args__ = (
+        # Message history and summary backfills look messages up by conversation
+        Index("ix_chat_messages_conversation_id_created_at", "conversation_id", "created_at"),
+    )
@@ -0,0 +1,53 @@
+from sqlalchemy import Column, Integer, String, Text, Float, Index, func
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from db.database import Base
+import uuid
+
+
+class Course(Base):
+    """Course catalog entry"""
+    __tablename__ = "courses"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        unique=True,
+        nullable=False
+    )
+    subject = Column(String, nullable=False)  # e.g. 'CS'
+    number = Column(String, nullable=False)   # e.g. '5800'
+    title = Column(String, nullable=False)
+    description = Column(Text)
+    credits = Column(String)  # '4' or a range such as '1-4'
+    extras = Column(JSONB, default=list)
+
+    __table_args__ = (
+        Index("ix_courses_subject_number", "subject", "number", unique=True),
+    )
+
+
+class Professor(Base):
+    """Professor profile"""
+    __tablename__ = "professors"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        unique=True,
+        nullable=False
+    )
+    name = Column(String, nullable=False)
+    department = Column(String)
+    rating = Column(Float)
+    num_reviews = Column(Integer, default=0)
+    url = Column(String, unique=True)
+
+
+# Serves case-insensitive prefix searches (lower(name) LIKE 'abc%')
+Index(
+    "ix_professors_name_lower",
+    func.lower(Professor.name).label("name_lower"),
+    postgresql_ops={"name_lower": "text_pattern_ops"}
+)
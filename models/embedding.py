@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String
-from pgvector.sqlalchemy import Vector
+from sqlalchemy import Column, Integer, String, Index
+from pgvector.sqlalchemy import Vector, HALFVEC, BIT
+from config import settings
 from db.database import Base
 import uuid
 from sqlalchemy.dialects.postgresql import UUID
 
+EMBEDDING_DIMENSIONS = 1536
+
+
 class Document(Base):
     __tablename__ = "documents"
 
@@ -15,4 +19,44 @@ class Document(Base):
         nullable=False
     )
     content = Column(String, nullable=False)
-    embedding = Column(Vector(1536))
+    embedding = Column(Vector(EMBEDDING_DIMENSIONS))
+
+    # Optional compact copies of embedding for first-pass ANN search; the
+    # full vector is only read to re-rank the candidates they return
+    if settings.DOCUMENT_STORE_HALF:
+        embedding_half = Column(HALFVEC(EMBEDDING_DIMENSIONS))
+    if settings.DOCUMENT_STORE_BINARY:
+        embedding_bit = Column(BIT(EMBEDDING_DIMENSIONS))
+
+    __table_args__ = tuple(
+        index for enabled, index in (
+            (settings.DOCUMENT_STORE_HALF, Index(
+                "ix_documents_embedding_half_hnsw",
+                "embedding_half",
+                postgresql_using="hnsw",
+                postgresql_ops={"embedding_half": "halfvec_cosine_ops"}
+            )),
+            (settings.DOCUMENT_STORE_BINARY, Index(
+                "ix_documents_embedding_bit_hnsw",
+                "embedding_bit",
+                postgresql_using="hnsw",
+                postgresql_ops={"embedding_bit": "bit_hamming_ops"}
+            )),
+        )
+        if enabled
+    )
+
+
+def stored_search_modes() -> tuple:
+    """Search modes usable with the embedding copies that are stored"""
+    modes = ["full"]
+    if settings.DOCUMENT_STORE_HALF:
+        modes.append("half")
+    if settings.DOCUMENT_STORE_BINARY:
+        modes.append("binary")
+    return tuple(modes)
+
+
+def binary_quantize(embedding) -> str:
+    """Quantize an embedding to one bit per dimension (1 where positive)"""
+    return "".join("1" if value > 0 else "0" for value in embedding)
@@ -0,0 +1,66 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from pgvector.sqlalchemy import Vector
+from db.database import Base
+from datetime import datetime
+import uuid
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class MemoryOutbox(Base):
+    """Pending chat messages waiting to be embedded into long-term memory"""
+    __tablename__ = "memory_outbox"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        unique=True,
+        nullable=False
+    )
+    message_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("chat_messages.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+    status = Column(String, default="pending", nullable=False)  # 'pending' or 'failed'
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text)
+    available_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow,
+                        server_default=func.now(), nullable=False)
+
+    # Relationships
+    message = relationship("ChatMessage")
+
+    __table_args__ = (
+        Index("ix_memory_outbox_status_available_at", "status", "available_at"),
+    )
+
+
+class MessageEmbedding(Base):
+    """Embedded chat message in a user's long-term memory"""
+    __tablename__ = "message_embeddings"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        unique=True,
+        nullable=False
+    )
+    message_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("chat_messages.id", ondelete="CASCADE"),
+        unique=True,
+        nullable=False
+    )
+    user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    conversation_id = Column(UUID(as_uuid=True), nullable=False)
+    role = Column(String, nullable=False)
+    content = Column(Text, nullable=False)
+    embedding = Column(Vector(1536), nullable=False)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow,
+                        server_default=func.now(), nullable=False)
@@ -0,0 +1,41 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from db.database import Base
+from datetime import datetime
+import uuid
+from sqlalchemy.dialects.postgresql import UUID
+
+
+class RefreshToken(Base):
+    """Refresh token model (only the SHA-256 digest is stored)"""
+    __tablename__ = "refresh_tokens"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        unique=True,
+        nullable=False
+    )
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+    # Set when the token was revoked by rotation rather than by logout
+    replaced_by_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("refresh_tokens.id", ondelete="SET NULL"),
+        nullable=True
+    )
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow,
+                        server_default=func.now(), nullable=False)
+
+    # Relationships
+    user = relationship("User", back_populates="refresh_tokens")
+    replaced_by = relationship("RefreshToken", remote_side=[id])
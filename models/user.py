@@ -40,3 +40,5 @@ class User(Base):
     # Relationships
     conversations = relationship(
         "ChatConversation", back_populates="user", cascade="all, delete-orphan")
+    refresh_tokens = relationship(
+        "RefreshToken", back_populates="user", cascade="all, delete-orphan")
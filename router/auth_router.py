@@ -2,8 +2,15 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from db.database import get_db
-from schemas.user_schema import UserCreate, UserResponse, Token
-from services.auth_service import authenticate_user, create_user, generate_token
+from schemas.user_schema import UserCreate, UserResponse, Token, RefreshRequest
+from services.auth_service import (
+    authenticate_user,
+    create_user,
+    generate_token,
+    issue_refresh_token,
+    rotate_refresh_token,
+    revoke_refresh_token
+)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -31,5 +38,30 @@ def login(
         )
 
     access_token = generate_token(user)
+    refresh_token = issue_refresh_token(user, db)
 
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token
+    }
+
+
+@router.post("/refresh", response_model=Token)
+def refresh(request: RefreshRequest, db: Session = Depends(get_db)):
+    """Exchange a refresh token for a new access and refresh token"""
+    access_token, refresh_token = rotate_refresh_token(
+        request.refresh_token, db)
+
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token
+    }
+
+
+@router.post("/logout")
+def logout(request: RefreshRequest, db: Session = Depends(get_db)):
+    """Revoke a refresh token"""
+    revoke_refresh_token(request.refresh_token, db)
+    return {"message": "Logged out successfully"}
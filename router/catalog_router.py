@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List
+from db.database import get_db
+from dependencies import get_current_user
+from models.user import User
+from schemas.catalog_schema import CourseResponse, ProfessorResponse
+from services.catalog_service import get_course_or_404, search_professors
+
+router = APIRouter(prefix="/catalog", tags=["Catalog"])
+
+
+@router.get("/courses/{subject}/{number}", response_model=CourseResponse)
+def get_course(
+    subject: str,
+    number: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Look up a course by subject and number, e.g. CS/5800"""
+    return get_course_or_404(subject, number, db)
+
+
+@router.get("/professors", response_model=List[ProfessorResponse])
+def get_professors(
+    name: str = Query(..., min_length=2),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Search professors by name"""
+    return search_professors(name, db)
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from typing import List
-from db.database import get_db
-from dependencies import get_current_user
+from db.database import get_db, get_read_db
+from dependencies import get_current_user, get_current_user_read
 from models.user import User
 from schemas.chat_schema import (
     ConversationCreate,
@@ -35,8 +35,8 @@ def create_new_conversation(
 
 @router.get("", response_model=List[ConversationResponse])
 def get_conversations(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: Session = Depends(get_read_db)
 ):
     """Get all conversations for current user"""
     return get_user_conversations(current_user.id, db)
@@ -45,8 +45,8 @@ def get_conversations(
 @router.get("/{conversation_id}", response_model=ConversationWithMessages)
 def get_conversation(
     conversation_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_read),
+    db: Session = Depends(get_read_db)
 ):
     """Get a specific conversation with all messages"""
     return get_conversation_by_id(conversation_id, current_user.id, db)
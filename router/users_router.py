@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends
 from schemas.user_schema import UserResponse
-from dependencies import get_current_user
+from dependencies import get_current_user_read
 from models.user import User
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: User = Depends(get_current_user_read)):
     """Get current user information"""
     return current_user
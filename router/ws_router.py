@@ -0,0 +1,269 @@
+import asyncio
+import json
+import time
+from uuid import UUID
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from config import settings
+from db.database import SessionLocal
+from schemas.chat_schema import MessageCreate, MessageResponse
+from services.chat_service import get_conversation_by_id, save_turn, stream_reply, title_from_message
+from services.user_service import get_user_by_email
+from utils.admission_control import admit, rate_limiter, release, REJECT_DETAILS
+from utils.security import decode_access_token_claims
+
+router = APIRouter(tags=["Chat"])
+
+
+class CloseFrame:
+    """Queued in place of a frame to close the socket once earlier frames are sent"""
+
+    def __init__(self, code: int, reason: str = ""):
+        self.code = code
+        self.reason = reason
+
+
+class ChatConnection:
+    """
+    Per-connection state for a WebSocket chat session.
+
+    The user and conversation are resolved once when the socket opens; every
+    turn after that only writes messages. Outgoing frames go through a
+    bounded queue so a slow client pauses generation instead of buffering it.
+    Only the sender task writes to the socket, closing included.
+    """
+
+    def __init__(self, websocket: WebSocket, user_id, conversation_id, title: str):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.conversation_id = conversation_id
+        self.title = title
+        self.outbound = asyncio.Queue(maxsize=settings.WS_SEND_QUEUE_SIZE)
+        self.last_sent = time.monotonic()
+        self.last_received = time.monotonic()
+        self.ping_sent_at = None
+        self.in_turn = False
+        self.closing = False
+        self.closed = False
+
+    async def send(self, frame: dict):
+        """Queue a frame, waiting while the client is behind"""
+        await self.outbound.put(frame)
+
+    async def close(self, code: int, reason: str = ""):
+        """Close the socket after the frames already queued have been sent"""
+        if not self.closing:
+            self.closing = True
+            await self.outbound.put(CloseFrame(code, reason))
+
+    async def sender(self):
+        try:
+            while True:
+                frame = await self.outbound.get()
+                if isinstance(frame, CloseFrame):
+                    self.closed = True
+                    await self.websocket.close(code=frame.code, reason=frame.reason)
+                    return
+                await self.websocket.send_json(frame)
+                self.last_sent = time.monotonic()
+        except Exception:
+            # Client is gone; keep draining so producers never block
+            self.closed = True
+            while True:
+                await self.outbound.get()
+
+    async def heartbeat(self):
+        """Ping an idle client and close the socket if it stops answering"""
+        interval = settings.WS_HEARTBEAT_SECONDS
+        while True:
+            await asyncio.sleep(interval)
+            if self.ping_sent_at is not None and self.last_received < self.ping_sent_at:
+                # No pong, or any other frame, within an interval of the ping
+                await self.close(status.WS_1001_GOING_AWAY, "Heartbeat timeout")
+                return
+
+            self.ping_sent_at = None
+            now = time.monotonic()
+            if now - self.last_sent >= interval and self.outbound.empty():
+                # Client frames are not read during a turn, so a pong can
+                # only be expected while the socket is idle
+                if not self.in_turn:
+                    self.ping_sent_at = now
+                await self.send({"type": "ping"})
+
+    async def handle_turn(self, content: str, db):
+        """Stream the reply to one user message, then store both messages"""
+        chunks = []
+        reply = stream_reply(self.conversation_id, self.user_id, content, db)
+        async for chunk in iterate_in_threadpool(reply):
+            chunks.append(chunk)
+            await self.send({"type": "token", "content": chunk})
+
+        new_title = None
+        if self.title == "New Chat":
+            new_title = self.title = title_from_message(content)
+
+        assistant_message = await run_in_threadpool(
+            save_turn,
+            self.conversation_id,
+            self.user_id,
+            content,
+            "".join(chunks),
+            new_title,
+            db
+        )
+        frame = {
+            "type": "message",
+            "message": MessageResponse.model_validate(assistant_message).model_dump(mode="json")
+        }
+        # Lets HTTP reads that follow this turn avoid stale replicas
+        if db.info.get("last_write_lsn"):
+            frame["last_write_lsn"] = db.info["last_write_lsn"]
+        await self.send(frame)
+
+
+def authorize(token: str, conversation_id: UUID, db):
+    """Resolve the user, conversation and token expiry for a connection, or None"""
+    claims = decode_access_token_claims(token) if token else None
+    email = claims.get("sub") if claims else None
+    if email is None or "exp" not in claims:
+        return None
+
+    user = get_user_by_email(email, db)
+    if user is None or not user.is_active:
+        return None
+
+    try:
+        conversation = get_conversation_by_id(conversation_id, user.id, db)
+    except HTTPException:
+        return None
+
+    return user, conversation, claims["exp"]
+
+
+class InvalidFrame(Exception):
+    """A client frame that is not a JSON object"""
+
+
+async def receive_frame(websocket: WebSocket) -> dict:
+    """Receive one client frame as a JSON object"""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", status.WS_1000_NORMAL_CLOSURE))
+
+    if message.get("text") is None:
+        raise InvalidFrame("Binary frames are not supported")
+
+    try:
+        frame = json.loads(message["text"])
+    except ValueError:
+        raise InvalidFrame("Frames must be JSON")
+
+    if not isinstance(frame, dict):
+        raise InvalidFrame("Frames must be JSON objects")
+
+    return frame
+
+
+@router.websocket("/ws/conversations/{conversation_id}")
+async def conversation_socket(websocket: WebSocket, conversation_id: UUID, token: str = ""):
+    """
+    Chat over a WebSocket; authenticate with ?token=<access token>.
+    The connection is closed when the access token expires.
+
+    Client frames: {"content": "..."} to send a message, {"type": "pong"}.
+    Server frames: ready, token, message, ping and error. Connecting and
+    every turn count against the same rate and concurrency limits as HTTP.
+    """
+    # Attributes stay loaded after commit, so turns never re-select them
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        authorized = await run_in_threadpool(authorize, token, conversation_id, db)
+        if authorized is None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+
+        user, conversation, expires_at = authorized
+        client_key = f"user:{user.email}"
+        if rate_limiter.acquire(client_key):
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+            return
+
+        connection = ChatConnection(
+            websocket, user.id, conversation.id, conversation.title)
+        await run_in_threadpool(db.commit)
+
+        await websocket.accept()
+        sender = asyncio.create_task(connection.sender())
+        heartbeat = asyncio.create_task(connection.heartbeat())
+        try:
+            await connection.send({"type": "ready", "conversation_id": str(conversation.id)})
+
+            while True:
+                token_ttl = expires_at - time.time()
+                if token_ttl <= 0:
+                    await connection.close(status.WS_1008_POLICY_VIOLATION, "Token expired")
+                    break
+
+                try:
+                    frame = await asyncio.wait_for(
+                        receive_frame(websocket),
+                        timeout=min(settings.WS_IDLE_TIMEOUT_SECONDS, token_ttl))
+                    connection.last_received = time.monotonic()
+                except InvalidFrame as exc:
+                    connection.last_received = time.monotonic()
+                    await connection.send({"type": "error", "detail": str(exc)})
+                    continue
+                except asyncio.TimeoutError:
+                    if time.time() >= expires_at:
+                        continue
+                    raise
+
+                if frame.get("type") == "pong":
+                    continue
+
+                try:
+                    message = MessageCreate.model_validate(frame)
+                except ValueError:
+                    await connection.send({"type": "error", "detail": "Invalid message"})
+                    continue
+
+                # Turns are limited like POST /conversations/{id}/messages
+                rejected, retry_after = admit(client_key, "chat")
+                if rejected:
+                    await connection.send({
+                        "type": "error",
+                        "detail": REJECT_DETAILS[rejected],
+                        "retry_after": retry_after
+                    })
+                    continue
+
+                started_at = time.perf_counter()
+                connection.in_turn = True
+                try:
+                    await connection.handle_turn(message.content, db)
+                except Exception:
+                    await run_in_threadpool(db.rollback)
+                    await connection.send({"type": "error", "detail": "Failed to process message"})
+                finally:
+                    connection.in_turn = False
+                    release("chat", started_at)
+
+                if connection.closing or connection.closed:
+                    break
+        except asyncio.TimeoutError:
+            await connection.close(status.WS_1000_NORMAL_CLOSURE)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            heartbeat.cancel()
+            if connection.closing and not sender.done():
+                # Let the sender flush queued frames and send the close
+                try:
+                    await asyncio.wait_for(
+                        asyncio.shield(sender), timeout=settings.WS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+            sender.cancel()
+    finally:
+        db.close()
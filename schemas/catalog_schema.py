@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from uuid import UUID
+
+
+class CourseResponse(BaseModel):
+    """Schema for course response"""
+    id: UUID
+    subject: str
+    number: str
+    title: str
+    description: Optional[str] = None
+    credits: Optional[str] = None
+    extras: List[str] = []
+
+    class Config:
+        from_attributes = True
+
+
+class ProfessorResponse(BaseModel):
+    """Schema for professor response"""
+    id: UUID
+    name: str
+    department: Optional[str] = None
+    rating: Optional[float] = None
+    num_reviews: int = 0
+    url: Optional[str] = None
+
+    class Config:
+        from_attributes = True
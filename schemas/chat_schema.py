@@ -1,7 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
+from models.chat import TITLE_MAX_LENGTH
 
 
 class MessageCreate(BaseModel):
@@ -22,7 +23,7 @@ class MessageResponse(BaseModel):
 
 class ConversationCreate(BaseModel):
     """Schema for creating a conversation"""
-    title: Optional[str] = "New Chat"
+    title: Optional[str] = Field("New Chat", max_length=TITLE_MAX_LENGTH)
 
 
 class ConversationResponse(BaseModel):
@@ -31,6 +32,9 @@ class ConversationResponse(BaseModel):
     title: str
     created_at: datetime
     updated_at: Optional[datetime]
+    message_count: int = 0
+    last_message_at: Optional[datetime] = None
+    last_message_preview: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -33,6 +33,12 @@ class Token(BaseModel):
     """Schema for JWT token"""
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+
+class RefreshRequest(BaseModel):
+    """Schema for refreshing or revoking a refresh token"""
+    refresh_token: str
 
 
 class TokenData(BaseModel):
@@ -1,9 +1,17 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
 from fastapi import HTTPException, status
 from models.user import User
+from models.refresh_token import RefreshToken
 from schemas.user_schema import UserCreate
-from utils.security import verify_password, get_password_hash, create_access_token
-from datetime import timedelta
+from utils.security import (
+    verify_password,
+    get_password_hash,
+    create_access_token,
+    create_refresh_token,
+    hash_refresh_token
+)
+from datetime import datetime, timedelta, timezone
 from config import settings
 
 
@@ -56,3 +64,132 @@ def generate_token(user: User):
     )
 
     return access_token
+
+
+def issue_refresh_token(user: User, db: Session):
+    """Create and store a new refresh token for user"""
+    purge_expired_refresh_tokens(db, user_id=user.id)
+    token = create_refresh_token()
+    db.add(RefreshToken(
+        user_id=user.id,
+        token_hash=hash_refresh_token(token),
+        expires_at=datetime.now(timezone.utc) +
+        timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    ))
+    db.commit()
+
+    return token
+
+
+def rotate_refresh_token(token: str, db: Session):
+    """
+    Exchange a refresh token for a new access/refresh token pair.
+
+    The presented token is revoked. A token that was rotated within the last
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS may be presented again, so concurrent
+    refreshes from one client all succeed; the new token then supersedes
+    the one issued earlier, so each rotation chain has one live token. Any
+    other reuse of a revoked token is treated as theft and revokes every
+    outstanding token of that user.
+    """
+    invalid_token_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    stored = db.query(RefreshToken)\
+        .filter(RefreshToken.token_hash == hash_refresh_token(token))\
+        .with_for_update()\
+        .first()
+
+    if not stored:
+        raise invalid_token_exception
+
+    now = datetime.now(timezone.utc)
+
+    if stored.revoked_at is not None and not _within_reuse_grace(stored, now):
+        revoke_user_refresh_tokens(stored.user_id, db)
+        raise invalid_token_exception
+
+    if stored.expires_at <= now or not stored.user.is_active:
+        raise invalid_token_exception
+
+    user = stored.user
+
+    new_token = create_refresh_token()
+    new_stored = RefreshToken(
+        user_id=user.id,
+        token_hash=hash_refresh_token(new_token),
+        expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    db.add(new_stored)
+    db.flush()
+
+    if stored.revoked_at is None:
+        stored.revoked_at = now
+    else:
+        # Reuse within the grace window: revoke the live end of the chain
+        # and link it to the new token, so reuse detection still covers it
+        tip = stored.replaced_by
+        while tip.revoked_at is not None and tip.replaced_by is not None:
+            tip = tip.replaced_by
+        if tip.revoked_at is None:
+            tip.revoked_at = now
+            tip.replaced_by_id = new_stored.id
+    stored.replaced_by_id = new_stored.id
+
+    purge_expired_refresh_tokens(db, user_id=user.id)
+    db.commit()
+
+    return generate_token(user), new_token
+
+
+def _within_reuse_grace(stored: RefreshToken, now: datetime) -> bool:
+    """True if a revoked token was just rotated and its successor is still live"""
+    if stored.replaced_by is None:
+        return False
+
+    if now - stored.revoked_at > timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS):
+        return False
+
+    # A successor revoked by logout (not by rotation) ends the session
+    successor = stored.replaced_by
+    return successor.revoked_at is None or successor.replaced_by_id is not None
+
+
+def revoke_refresh_token(token: str, db: Session):
+    """Revoke a single refresh token"""
+    db.query(RefreshToken)\
+        .filter(
+            RefreshToken.token_hash == hash_refresh_token(token),
+            RefreshToken.revoked_at.is_(None)
+    )\
+        .update({RefreshToken.revoked_at: func.now()}, synchronize_session=False)
+    db.commit()
+
+
+def revoke_user_refresh_tokens(user_id, db: Session):
+    """Revoke every outstanding refresh token of a user"""
+    db.query(RefreshToken)\
+        .filter(
+            RefreshToken.user_id == user_id,
+            RefreshToken.revoked_at.is_(None)
+    )\
+        .update({RefreshToken.revoked_at: func.now()}, synchronize_session=False)
+    db.commit()
+
+
+def purge_expired_refresh_tokens(db: Session, user_id=None) -> int:
+    """
+    Delete expired refresh tokens, of one user or of everyone.
+
+    Revoked tokens are kept until they expire so that their reuse is still
+    detected. Does not commit.
+    """
+    query = db.query(RefreshToken)\
+        .filter(RefreshToken.expires_at < func.now())
+    if user_id is not None:
+        query = query.filter(RefreshToken.user_id == user_id)
+
+    return query.delete(synchronize_session=False)
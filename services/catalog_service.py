@@ -0,0 +1,159 @@
+import re
+import time
+from typing import List, Optional, Set, Tuple
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from models.course import Course, Professor
+
+# Matches course codes such as 'CS 5800' or 'CS-5800'; subjects are only
+# accepted if they appear in the courses table (see known_subjects)
+COURSE_CODE_PATTERN = re.compile(r"\b([A-Z]{2,4})\s?-?\s?(\d{4})\b")
+
+CREDIT_KEYWORDS = ("credit", "hours", "units")
+PREREQ_KEYWORDS = ("prereq", "prerequisite", "corequisite", "coreq")
+
+# Messages that ask for catalog facts rather than advice or discussion. Each
+# phrase is tied to the course code it asks about, so questions that merely
+# mention a course ('what is the best way to prepare for CS 5800?') are not
+# lookups. Codes stay case-sensitive like COURSE_CODE_PATTERN.
+_CODE = r"(?-i:[A-Z]{2,4}\s?-?\s?\d{4})"
+_CODES = rf"(the\s+)?(course\s+)?{_CODE}(\s*(,|and|&)\s*{_CODE})*"
+_FACTS = r"(credits?|credit\s+hours|units|prereq\w*|pre-?requisites?|coreq\w*)"
+LOOKUP_QUESTION_PATTERN = re.compile(
+    rf"^\s*(what\s*(is|'s|are)|tell\s+me\s+about|describe|info(rmation)?\s+(on|about|for)"
+    rf"|details\s+(of|for|on|about))\s+{_CODES}(\s+about)?\s*[?.!]*\s*$"
+    rf"|\b(how\s+many\s+)?{_FACTS}\s+(is|are|does|do|for|of|in|to)\s+{_CODES}"
+    rf"|\b{_CODE}('s)?\s+(have\s+(any\s+)?)?{_FACTS}",
+    re.IGNORECASE
+)
+
+SUBJECT_CACHE_SECONDS = 300
+_subject_cache = {"subjects": set(), "loaded_at": 0.0}
+
+
+def normalize_course_code(subject: str, number: str) -> Tuple[str, str]:
+    """Normalize a subject/number pair to the form stored in the table"""
+    return subject.strip().upper(), number.strip()
+
+
+def known_subjects(db: Session) -> Set[str]:
+    """Subject codes present in the catalog, cached for a few minutes"""
+    now = time.monotonic()
+    if now - _subject_cache["loaded_at"] > SUBJECT_CACHE_SECONDS:
+        _subject_cache["subjects"] = {
+            subject for (subject,) in db.query(Course.subject).distinct()
+        }
+        _subject_cache["loaded_at"] = now
+    return _subject_cache["subjects"]
+
+
+def find_course_codes(text: str, subjects: Set[str]) -> List[Tuple[str, str]]:
+    """Extract distinct course codes with a known subject from free text"""
+    codes = []
+    for subject, number in COURSE_CODE_PATTERN.findall(text):
+        code = normalize_course_code(subject, number)
+        if code[0] in subjects and code not in codes:
+            codes.append(code)
+    return codes
+
+
+def is_lookup_question(text: str) -> bool:
+    """True if the message asks for catalog facts about a course"""
+    if LOOKUP_QUESTION_PATTERN.search(text):
+        return True
+
+    # A bare code such as 'CS 5800?' is a lookup as well
+    remainder = COURSE_CODE_PATTERN.sub("", text)
+    return len(re.findall(r"\w+", remainder)) == 0
+
+
+def get_course_by_code(subject: str, number: str, db: Session):
+    """Get a course by subject and number"""
+    subject, number = normalize_course_code(subject, number)
+    return db.query(Course)\
+        .filter(Course.subject == subject, Course.number == number)\
+        .first()
+
+
+def get_course_or_404(subject: str, number: str, db: Session):
+    """Get a course by code or raise 404"""
+    course = get_course_by_code(subject, number, db)
+
+    if not course:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Course not found"
+        )
+
+    return course
+
+
+def escape_like(value: str) -> str:
+    """Escape LIKE wildcards so user input matches literally"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_professors(name: str, db: Session, limit: int = 10):
+    """Find professors by name prefix (case-insensitive)"""
+    prefix = escape_like(name.strip().lower()) + "%"
+    return db.query(Professor)\
+        .filter(func.lower(Professor.name).like(prefix, escape="\\"))\
+        .order_by(Professor.name)\
+        .limit(limit)\
+        .all()
+
+
+def format_course_answer(course: Course, question: str) -> str:
+    """Build a plain-text answer about a course from its catalog fields"""
+    code = f"{course.subject} {course.number}"
+    question_lower = question.lower()
+
+    if any(keyword in question_lower for keyword in CREDIT_KEYWORDS):
+        if course.credits:
+            return f"{code} ({course.title}) is worth {course.credits} credit hours."
+        return f"The catalog does not list credit hours for {code} ({course.title})."
+
+    if any(keyword in question_lower for keyword in PREREQ_KEYWORDS):
+        requisites = [
+            extra for extra in (course.extras or [])
+            if "requisite" in extra.lower()
+        ]
+        if requisites:
+            return f"{code} ({course.title}): " + " ".join(requisites)
+        return f"The catalog does not list prerequisites for {code} ({course.title})."
+
+    answer = f"{code}: {course.title}"
+    if course.credits:
+        answer += f" ({course.credits} credit hours)"
+    if course.description:
+        answer += f"\n\n{course.description}"
+    return answer
+
+
+def answer_course_question(question: str, db: Session) -> Optional[str]:
+    """
+    Answer a course lookup question directly from the courses table.
+
+    Returns None when the message is not a lookup question or names no
+    known course, so the caller can fall back to the regular AI response.
+    Codes that are not in the catalog are ignored.
+    """
+    if not COURSE_CODE_PATTERN.search(question):
+        return None
+
+    codes = find_course_codes(question, known_subjects(db))
+    if not codes or not is_lookup_question(question):
+        return None
+
+    courses = db.query(Course)\
+        .filter(tuple_(Course.subject, Course.number).in_(codes))\
+        .all()
+    if not courses:
+        return None
+
+    by_code = {(course.subject, course.number): course for course in courses}
+    return "\n\n".join(
+        format_course_answer(by_code[code], question)
+        for code in codes if code in by_code
+    )
@@ -1,9 +1,11 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 from fastapi import HTTPException, status
-from models.chat import ChatConversation, ChatMessage
+from models.chat import ChatConversation, ChatMessage, PREVIEW_LENGTH
 from schemas.chat_schema import ConversationCreate, MessageCreate
-from utils.ai_helper import generate_ai_response
+from services.catalog_service import answer_course_question
+from services.memory_service import memory_indexer, record_for_indexing, recall_memories
+from utils.ai_helper import generate_ai_response, stream_ai_response
 
 
 def create_conversation(user_id: int, conversation_data: ConversationCreate, db: Session):
@@ -61,8 +63,12 @@ def send_message(conversation_id: int, user_id: int, message_data: MessageCreate
     )
     db.add(user_message)
 
-    # Generate AI response
-    ai_response_text = generate_ai_response(message_data.content)
+    # Answer course questions straight from the catalog, else generate AI response
+    ai_response_text = answer_course_question(message_data.content, db)
+    if ai_response_text is None:
+        memories = recall_memories(
+            user_id, message_data.content, db, exclude_conversation_id=conversation_id)
+        ai_response_text = generate_ai_response(message_data.content, memories)
 
     # Create assistant message
     assistant_message = ChatMessage(
@@ -72,18 +78,95 @@ def send_message(conversation_id: int, user_id: int, message_data: MessageCreate
     )
     db.add(assistant_message)
 
-    # Update conversation timestamp and title if needed
+    # Record both messages for long-term memory indexing
+    outbox_ids = record_for_indexing(
+        [user_message, assistant_message], user_id, db)
+
+    # Update conversation timestamp, summary and title if needed
     conversation.updated_at = func.now()
+    conversation.message_count = ChatConversation.message_count + 2
+    conversation.last_message_at = func.now()
+    conversation.last_message_preview = message_preview(ai_response_text)
     if conversation.title == "New Chat":
-        conversation.title = message_data.content[:50] + \
-            ("..." if len(message_data.content) > 50 else "")
+        conversation.title = title_from_message(message_data.content)
 
     db.commit()
+    memory_indexer.enqueue(outbox_ids)
     db.refresh(assistant_message)
 
     return assistant_message
 
 
+def title_from_message(content: str) -> str:
+    """Derive a conversation title from its first message"""
+    return content[:50] + ("..." if len(content) > 50 else "")
+
+
+def message_preview(content: str) -> str:
+    """Shorten message content for the conversation list"""
+    return content[:PREVIEW_LENGTH] + ("..." if len(content) > PREVIEW_LENGTH else "")
+
+
+def stream_reply(conversation_id, user_id, content: str, db: Session):
+    """Yield the reply to a message in chunks as it is generated"""
+    course_answer = answer_course_question(content, db)
+    if course_answer is not None:
+        yield course_answer
+        return
+
+    memories = recall_memories(
+        user_id, content, db, exclude_conversation_id=conversation_id)
+    yield from stream_ai_response(content, memories)
+
+
+def save_turn(
+    conversation_id,
+    user_id,
+    user_content: str,
+    assistant_content: str,
+    new_title: str,
+    db: Session
+):
+    """
+    Store a user/assistant message pair for an already authorized conversation.
+
+    Unlike send_message this issues no SELECTs: ownership is checked by the
+    caller and the conversation row is updated in place. new_title, if set,
+    replaces the conversation title.
+    """
+    user_message = ChatMessage(
+        conversation_id=conversation_id,
+        role="user",
+        content=user_content
+    )
+    assistant_message = ChatMessage(
+        conversation_id=conversation_id,
+        role="assistant",
+        content=assistant_content
+    )
+    db.add_all([user_message, assistant_message])
+
+    outbox_ids = record_for_indexing(
+        [user_message, assistant_message], user_id, db)
+
+    values = {
+        ChatConversation.updated_at: func.now(),
+        ChatConversation.message_count: ChatConversation.message_count + 2,
+        ChatConversation.last_message_at: func.now(),
+        ChatConversation.last_message_preview: message_preview(assistant_content)
+    }
+    if new_title:
+        values[ChatConversation.title] = new_title
+    db.query(ChatConversation)\
+        .filter(ChatConversation.id == conversation_id)\
+        .update(values, synchronize_session=False)
+
+    db.commit()
+    memory_indexer.enqueue(outbox_ids)
+
+    return assistant_message
+
+
 def delete_conversation(conversation_id: int, user_id: int, db: Session):
     """Delete a conversation"""
     conversation = db.query(ChatConversation)\
@@ -0,0 +1,84 @@
+from typing import List
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from config import settings
+from models.embedding import Document, binary_quantize, stored_search_modes
+
+SEARCH_MODES = stored_search_modes()
+
+if settings.DOCUMENT_SEARCH_MODE not in SEARCH_MODES:
+    raise RuntimeError(
+        f"DOCUMENT_SEARCH_MODE '{settings.DOCUMENT_SEARCH_MODE}' needs its embedding "
+        f"copy to be stored; stored modes are {', '.join(SEARCH_MODES)}"
+    )
+
+
+def create_document(content: str, embedding: List[float], db: Session):
+    """Store a document with its embedding and any enabled compact copies"""
+    document = Document(content=content, embedding=embedding)
+    if settings.DOCUMENT_STORE_HALF:
+        document.embedding_half = embedding
+    if settings.DOCUMENT_STORE_BINARY:
+        document.embedding_bit = binary_quantize(embedding)
+
+    db.add(document)
+    db.commit()
+    db.refresh(document)
+
+    return document
+
+
+def search_documents(
+    query_embedding: List[float],
+    db: Session,
+    k: int = 5,
+    mode: str = settings.DOCUMENT_SEARCH_MODE,
+    candidates: int = settings.DOCUMENT_RERANK_CANDIDATES
+):
+    """
+    Return the k documents closest to query_embedding by cosine distance.
+
+    'full' runs a single search over the full vectors. 'half' and 'binary'
+    first fetch `candidates` rows through the compact halfvec/bit index and
+    then re-rank only those rows against the full vectors.
+    Rows are (id, content, distance).
+    """
+    if mode not in SEARCH_MODES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown or unstored search mode '{mode}'"
+        )
+
+    candidates = max(candidates, k)
+    if mode != "full":
+        # HNSW returns at most ef_search rows (40 by default, 1000 at most),
+        # so widen it to the shortlist size
+        ef_search = min(max(candidates, 40), 1000)
+        db.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+
+    return db.execute(search_statement(query_embedding, k, mode, candidates)).all()
+
+
+def search_statement(query_embedding: List[float], k: int, mode: str, candidates: int):
+    """Build the search_documents query; see there for the modes"""
+    if mode == "full":
+        distance = Document.embedding.cosine_distance(query_embedding)
+        return select(Document.id, Document.content, distance.label("distance"))\
+            .order_by(distance)\
+            .limit(k)
+
+    if mode == "half":
+        first_pass = Document.embedding_half.cosine_distance(query_embedding)
+    else:
+        first_pass = Document.embedding_bit.hamming_distance(
+            binary_quantize(query_embedding))
+
+    shortlist = select(Document.id, Document.content, Document.embedding)\
+        .order_by(first_pass)\
+        .limit(candidates)\
+        .subquery()
+    distance = shortlist.c.embedding.cosine_distance(query_embedding)
+    return select(shortlist.c.id, shortlist.c.content, distance.label("distance"))\
+        .order_by(distance)\
+        .limit(k)
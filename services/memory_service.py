@@ -0,0 +1,328 @@
+"""
+Long-term conversation memory.
+
+New chat messages are recorded in the memory_outbox table in the same
+transaction that stores them. After commit, their outbox ids are handed to
+an in-process worker pool that embeds them in batches and writes them to
+message_embeddings. A periodic sweep re-enqueues outbox rows that are due
+(retries, or work left over from a previous process), so nothing is lost on
+restart.
+"""
+import logging
+import queue
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import insert
+from config import settings
+from db.database import SessionLocal
+from models.memory import MemoryOutbox, MessageEmbedding
+from utils.embeddings import embed_text, embed_texts, is_input_error
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_SECONDS = 5
+# Long enough to cover the embedding request, including batch splits
+LEASE_SECONDS = 300
+
+
+class MemoryIndexer:
+    """Background worker pool that embeds outbox messages into memory"""
+
+    def __init__(
+        self,
+        workers: int = settings.MEMORY_WORKERS,
+        batch_size: int = settings.MEMORY_BATCH_SIZE,
+        max_attempts: int = settings.MEMORY_MAX_ATTEMPTS,
+        sweep_seconds: int = settings.MEMORY_SWEEP_SECONDS
+    ):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.sweep_seconds = sweep_seconds
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """Start the worker and sweeper threads"""
+        if self._threads:
+            return
+
+        self._stop.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._work, name=f"memory-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        sweeper = threading.Thread(
+            target=self._sweep, name="memory-sweeper", daemon=True)
+        sweeper.start()
+        self._threads.append(sweeper)
+
+    def stop(self, timeout: float = 5.0):
+        """Stop all threads; unfinished work stays in the outbox"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def enqueue(self, outbox_ids: List):
+        """Schedule committed outbox rows for indexing"""
+        if not self._threads:
+            return
+        for outbox_id in outbox_ids:
+            self._queue.put(outbox_id)
+
+    def _next_batch(self) -> List:
+        try:
+            batch = [self._queue.get(timeout=1)]
+        except queue.Empty:
+            return []
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _work(self):
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            if batch:
+                self._process(batch)
+
+    def _sweep(self):
+        while not self._stop.wait(self.sweep_seconds):
+            db = SessionLocal()
+            try:
+                due = db.query(MemoryOutbox.id)\
+                    .filter(
+                        MemoryOutbox.status == "pending",
+                        MemoryOutbox.available_at <= func.now()
+                )\
+                    .order_by(MemoryOutbox.available_at)\
+                    .limit(self.batch_size * self.workers * 4)\
+                    .all()
+                for (outbox_id,) in due:
+                    self._queue.put(outbox_id)
+            except Exception:
+                logger.exception("Memory outbox sweep failed")
+            finally:
+                db.close()
+
+    def _process(self, outbox_ids: List):
+        claimed = self._claim(outbox_ids)
+        if not claimed:
+            return
+
+        embedded, failures = self._embed(claimed)
+        if embedded:
+            try:
+                self._store(embedded)
+            except Exception as exc:
+                # e.g. a dimension mismatch after EMBEDDING_MODEL changed
+                logger.exception("Storing memory embeddings failed")
+                failures.update({item["id"]: exc for item, _ in embedded})
+
+        if failures:
+            self._record_failures(failures)
+
+    def _claim(self, outbox_ids: List) -> List[dict]:
+        """
+        Lease due outbox rows to this worker and return what is needed to
+        embed them.
+
+        The lease moves available_at forward and is committed straight away,
+        so no lock or transaction is held while the embedding API is called.
+        If the worker dies, the lease runs out and the sweep retries the rows.
+        """
+        db = SessionLocal()
+        try:
+            # SKIP LOCKED keeps two workers from claiming the same row
+            rows = db.query(MemoryOutbox)\
+                .filter(
+                    MemoryOutbox.id.in_(outbox_ids),
+                    MemoryOutbox.status == "pending",
+                    MemoryOutbox.available_at <= func.now()
+            )\
+                .with_for_update(skip_locked=True)\
+                .all()
+
+            claimed = []
+            for row in rows:
+                text = row.message.content.strip()[:settings.MEMORY_MAX_CHARS]
+                if not text:
+                    # Blank messages have nothing to remember
+                    db.delete(row)
+                    continue
+
+                row.available_at = func.now() + timedelta(seconds=LEASE_SECONDS)
+                claimed.append({
+                    "id": row.id,
+                    "text": text,
+                    "message_id": row.message_id,
+                    "user_id": row.user_id,
+                    "conversation_id": row.message.conversation_id,
+                    "role": row.message.role,
+                    "content": row.message.content
+                })
+
+            db.commit()
+            return claimed
+        except Exception:
+            db.rollback()
+            logger.exception("Claiming memory outbox rows failed")
+            return []
+        finally:
+            db.close()
+
+    def _embed(self, items: List[dict]) -> Tuple[list, dict]:
+        """
+        Embed claimed items, returning (item, embedding) pairs for those that
+        succeeded and a {outbox id: exception} dict for those that failed.
+
+        Only a rejected input splits the batch, to find the offending
+        message; outages, rate limits and timeouts fail the whole batch
+        without further requests.
+        """
+        try:
+            embeddings = embed_texts([item["text"] for item in items])
+            return list(zip(items, embeddings)), {}
+        except Exception as exc:
+            if len(items) == 1 or not is_input_error(exc):
+                return [], {item["id"]: exc for item in items}
+
+        middle = len(items) // 2
+        embedded, failures = self._embed(items[:middle])
+        more_embedded, more_failures = self._embed(items[middle:])
+        failures.update(more_failures)
+        return embedded + more_embedded, failures
+
+    def _store(self, embedded: list):
+        """Write embeddings and delete their outbox rows in one transaction"""
+        db = SessionLocal()
+        try:
+            db.execute(
+                insert(MessageEmbedding)
+                .values([
+                    {
+                        "message_id": item["message_id"],
+                        "user_id": item["user_id"],
+                        "conversation_id": item["conversation_id"],
+                        "role": item["role"],
+                        "content": item["content"],
+                        "embedding": embedding
+                    }
+                    for item, embedding in embedded
+                ])
+                .on_conflict_do_nothing(index_elements=[MessageEmbedding.message_id])
+            )
+            db.query(MemoryOutbox)\
+                .filter(MemoryOutbox.id.in_([item["id"] for item, _ in embedded]))\
+                .delete(synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _record_failures(self, failures: dict):
+        """Count a failed attempt on each row and schedule its retry"""
+        db = SessionLocal()
+        try:
+            rows = db.query(MemoryOutbox)\
+                .filter(MemoryOutbox.id.in_(list(failures)))\
+                .all()
+            for row in rows:
+                exc = failures[row.id]
+                logger.warning("Indexing message %s failed: %s", row.message_id, exc)
+                row.attempts += 1
+                row.last_error = str(exc)[:1000]
+                if row.attempts >= self.max_attempts:
+                    row.status = "failed"
+                else:
+                    row.available_at = datetime.now(timezone.utc) + timedelta(
+                        seconds=RETRY_BASE_SECONDS * 2 ** (row.attempts - 1))
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Recording memory indexing failures failed")
+        finally:
+            db.close()
+
+
+memory_indexer = MemoryIndexer()
+
+
+def record_for_indexing(messages: list, user_id, db: Session) -> List:
+    """
+    Add outbox rows for messages to the current transaction.
+
+    Returns the outbox ids, to be passed to memory_indexer.enqueue() once
+    the transaction has committed.
+    """
+    if not settings.MEMORY_ENABLED:
+        return []
+
+    # Ids are generated here so they can be read after commit without a refresh
+    outbox_rows = [
+        MemoryOutbox(id=uuid.uuid4(), message=message, user_id=user_id)
+        for message in messages
+    ]
+    db.add_all(outbox_rows)
+
+    return [row.id for row in outbox_rows]
+
+
+def search_user_memory(
+    user_id,
+    query: str,
+    db: Session,
+    k: int = settings.MEMORY_TOP_K,
+    exclude_conversation_id=None
+) -> List[MessageEmbedding]:
+    """Return a user's k most similar past messages"""
+    query_embedding = embed_text(
+        query[:settings.MEMORY_MAX_CHARS], timeout=settings.MEMORY_QUERY_TIMEOUT_SECONDS)
+
+    memories = db.query(MessageEmbedding)\
+        .filter(MessageEmbedding.user_id == user_id)
+    if exclude_conversation_id is not None:
+        memories = memories.filter(
+            MessageEmbedding.conversation_id != exclude_conversation_id)
+
+    return memories\
+        .order_by(MessageEmbedding.embedding.cosine_distance(query_embedding))\
+        .limit(k)\
+        .all()
+
+
+def recall_memories(user_id, query: str, db: Session, exclude_conversation_id=None) -> Optional[List[str]]:
+    """
+    Best-effort memory lookup for a chat turn; never fails the turn.
+
+    Returns None when memory is disabled or the lookup fails. The query
+    embedding is bounded by MEMORY_QUERY_TIMEOUT_SECONDS.
+    """
+    if not settings.MEMORY_ENABLED or not query.strip():
+        return None
+
+    try:
+        # A savepoint keeps a failed lookup from aborting the caller's transaction
+        with db.begin_nested():
+            return [
+                memory.content
+                for memory in search_user_memory(
+                    user_id, query, db, exclude_conversation_id=exclude_conversation_id)
+            ]
+    except Exception:
+        logger.exception("Memory lookup failed")
+        return None
@@ -0,0 +1,14 @@
+import os
+
+# config.Settings requires these; the tests never reach OpenAI, and the
+# database tests skip themselves when no server is reachable
+for name, value in {
+    "OPENAI_API_KEY": "test",
+    "POSTGRES_USER": "teamuser",
+    "POSTGRES_PASSWORD": "secretpassword",
+    "POSTGRES_DB": "teamdb",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "BACKEND_URL": "http://localhost:8000",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,111 @@
+"""
+Token bucket and AIMD concurrency limiter logic, with a fake clock.
+"""
+import pytest
+
+from utils import admission_control
+from utils.admission_control import AdaptiveConcurrencyLimiter, TokenBucketLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(admission_control.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_bucket_allows_burst_then_waits_for_refill(clock):
+    limiter = TokenBucketLimiter(rate_per_second=2, burst=3)
+
+    assert [limiter.acquire("a") for _ in range(3)] == [0, 0, 0]
+    assert limiter.acquire("a") == pytest.approx(0.5)
+
+    clock[0] += 0.5
+    assert limiter.acquire("a") == 0
+    assert limiter.acquire("a") > 0
+
+
+def test_bucket_refill_is_capped_at_burst(clock):
+    limiter = TokenBucketLimiter(rate_per_second=1, burst=2)
+    limiter.acquire("a")
+
+    clock[0] += 3600
+    assert [limiter.acquire("a") for _ in range(3)] == [0, 0, pytest.approx(1)]
+
+
+def test_buckets_are_per_key(clock):
+    limiter = TokenBucketLimiter(rate_per_second=1, burst=1)
+
+    assert limiter.acquire("a") == 0
+    assert limiter.acquire("a") > 0
+    assert limiter.acquire("b") == 0
+
+
+def test_bucket_count_is_capped_by_evicting_least_recently_used(clock):
+    limiter = TokenBucketLimiter(rate_per_second=1, burst=1, max_keys=2)
+    limiter.acquire("a")
+    limiter.acquire("b")
+    limiter.acquire("a")
+
+    # Every bucket is still active, yet the cap holds
+    limiter.acquire("c")
+    assert list(limiter._buckets) == ["a", "c"]
+
+    # "b" was evicted, so it starts over with a full bucket
+    assert limiter.acquire("b") == 0
+    assert len(limiter._buckets) == 2
+
+
+def make_limiter(**overrides):
+    options = dict(initial_limit=10, min_limit=2, max_limit=12,
+                   target_p95_ms=100, window=20, adjust_every=10)
+    options.update(overrides)
+    return AdaptiveConcurrencyLimiter(**options)
+
+
+def test_concurrency_limit_rejects_when_full():
+    limiter = make_limiter(initial_limit=2)
+
+    assert limiter.try_acquire() and limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+    limiter.release(10)
+    assert limiter.in_flight == 1
+    assert limiter.try_acquire()
+
+
+def run_requests(limiter, count, latency_ms):
+    for _ in range(count):
+        assert limiter.try_acquire()
+        limiter.release(latency_ms)
+
+
+def test_limit_grows_by_one_while_under_target():
+    limiter = make_limiter()
+
+    run_requests(limiter, 10, latency_ms=50)
+    assert limiter.limit == 11
+    assert limiter.p95_ms == 50
+
+    run_requests(limiter, 30, latency_ms=50)
+    assert limiter.limit == 12  # capped at max_limit
+
+
+def test_limit_shrinks_multiplicatively_while_over_target():
+    limiter = make_limiter()
+
+    run_requests(limiter, 10, latency_ms=500)
+    assert limiter.limit == 9
+
+    for _ in range(20):
+        run_requests(limiter, 10, latency_ms=500)
+    assert limiter.limit == 2  # floored at min_limit
+
+
+def test_p95_ignores_a_few_slow_requests():
+    limiter = make_limiter(window=100, adjust_every=100)
+
+    run_requests(limiter, 96, latency_ms=50)
+    run_requests(limiter, 4, latency_ms=5000)
+    assert limiter.p95_ms == 50
+    assert limiter.limit == 11
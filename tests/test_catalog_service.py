@@ -0,0 +1,52 @@
+"""
+Course-code detection for the catalog fast path; no database needed.
+"""
+import pytest
+
+from services.catalog_service import find_course_codes, is_lookup_question
+
+SUBJECTS = {"CS", "DS", "MATH"}
+
+
+def test_find_course_codes_normalizes_and_dedupes():
+    codes = find_course_codes("Compare CS 5800, CS-5800 and DS5110", SUBJECTS)
+    assert codes == [("CS", "5800"), ("DS", "5110")]
+
+
+@pytest.mark.parametrize("text", [
+    "I took cs 5800 last year",
+    "I have 1200 dollars",
+    "Is ABCD 1234 a course?",
+    "I scored IN 2024",
+])
+def test_find_course_codes_ignores_non_codes(text):
+    assert find_course_codes(text, SUBJECTS) == []
+
+
+@pytest.mark.parametrize("text", [
+    "CS 5800",
+    "CS 5800?",
+    "What is CS 5800?",
+    "what's CS-5800",
+    "Tell me about CS 5800 and DS 5110",
+    "What is CS 5800 about?",
+    "How many credits is CS 5800?",
+    "credits for CS 5800",
+    "What are the prerequisites for CS 5800?",
+    "Does CS 5800 have any prereqs?",
+    "CS 5800 credits?",
+])
+def test_lookup_questions(text):
+    assert is_lookup_question(text)
+
+
+@pytest.mark.parametrize("text", [
+    "What is the best way to prepare for CS 5800?",
+    "how many credits do I need to graduate? I have CS 5800",
+    "I failed CS 5800, what now?",
+    "Is CS 5800 hard?",
+    "What is a good elective after CS 5800?",
+    "Should I take CS 5800 or DS 5110 first?",
+])
+def test_not_lookup_questions(text):
+    assert not is_lookup_question(text)
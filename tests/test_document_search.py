@@ -0,0 +1,89 @@
+"""
+Document search: the shape of the first-pass + re-rank query, and the
+ranking it returns against a real database when one is reachable.
+"""
+import random
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from db.database import SessionLocal
+from models.embedding import EMBEDDING_DIMENSIONS, Document, binary_quantize
+from services.document_service import SEARCH_MODES, search_documents, search_statement
+
+
+def random_embedding():
+    return [random.uniform(-1, 1) for _ in range(EMBEDDING_DIMENSIONS)]
+
+
+def compiled(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect())).replace("\n", " ")
+
+
+def test_full_mode_is_a_single_search():
+    sql = compiled(search_statement(random_embedding(), k=5, mode="full", candidates=100))
+    assert "embedding_half" not in sql and "embedding_bit" not in sql
+    assert sql.count("ORDER BY") == 1
+
+
+@pytest.mark.parametrize("mode, column, operator", [
+    ("half", "embedding_half", "<=>"),
+    ("binary", "embedding_bit", "<~>"),
+])
+def test_compact_modes_rerank_shortlist_on_full_vectors(mode, column, operator):
+    if mode not in SEARCH_MODES:
+        pytest.skip(f"{column} is not stored")
+
+    stmt = search_statement(random_embedding(), k=5, mode=mode, candidates=100)
+    inner, _, outer = compiled(stmt).partition(") AS anon_1")
+
+    # The shortlist is ordered by the compact copy and limited to candidates
+    assert f"documents.{column} {operator}" in inner
+    assert "LIMIT %(param_1)s" in inner
+    # Only the shortlist is re-ranked, by full-vector cosine distance
+    assert "FROM (SELECT documents.id" in inner
+    assert "ORDER BY anon_1.embedding <=>" in outer
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    assert params["param_1"] == 100 and params["param_2"] == 5
+
+
+def test_unstored_mode_is_rejected():
+    with pytest.raises(Exception) as exc_info:
+        search_documents(random_embedding(), db=None, mode="unknown")
+    assert exc_info.value.status_code == 400
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        session.execute(text("SELECT 1 FROM documents LIMIT 1"))
+    except Exception:
+        session.close()
+        pytest.skip("no database with the documents table")
+    yield session
+    session.rollback()
+    session.close()
+
+
+@pytest.mark.parametrize("mode", SEARCH_MODES)
+def test_search_ranks_by_full_distance(db, mode):
+    documents = [
+        Document(content=f"doc {i}", embedding=embedding, **{
+            column: value for column, value in (
+                ("embedding_half", embedding),
+                ("embedding_bit", binary_quantize(embedding)),
+            ) if hasattr(Document, column)
+        })
+        for i, embedding in enumerate(random_embedding() for _ in range(20))
+    ]
+    db.add_all(documents)
+    db.flush()
+
+    target = documents[7]
+    results = search_documents(list(target.embedding), db, k=5, mode=mode, candidates=50)
+
+    assert results[0].id == target.id
+    assert results[0].distance == pytest.approx(0, abs=1e-6)
+    distances = [row.distance for row in results]
+    assert distances == sorted(distances)
@@ -0,0 +1,262 @@
+"""
+Admission control for the HTTP API.
+
+Each request first passes a per-user token bucket (429 when empty), then a
+concurrency limit for its route class (503 when full). Route classes keep
+separate limits and latency targets, so slow LLM-bound chat turns and
+bcrypt-bound logins do not drag down the limit for cheap reads. Each limit
+adapts to its class's latency: it shrinks multiplicatively while p95 is
+above target and grows by one while it is below.
+
+WebSocket chat turns go through the same checks via admit()/release().
+
+All state is touched only from the event loop, so no locks are needed.
+"""
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Optional, Tuple
+from starlette.responses import JSONResponse
+from config import settings
+from utils.security import decode_access_token
+
+EXEMPT_PATHS = ("/health", "/metrics", "/docs", "/redoc", "/openapi.json")
+
+
+class TokenBucketLimiter:
+    """
+    Per-key token buckets refilled lazily on access.
+
+    At most max_keys buckets are kept; beyond that the least recently used
+    one is dropped. That key simply starts over with a full bucket.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int, max_keys: int = 100000):
+        self.rate = rate_per_second
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+
+    def acquire(self, key: str) -> float:
+        """Take a token for key; return 0 if allowed, else seconds to wait"""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._buckets.popitem(last=False)
+            bucket = self._buckets[key] = [float(self.burst), now]
+        else:
+            self._buckets.move_to_end(key)
+
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+
+        bucket[0] = tokens
+        return (1 - tokens) / self.rate
+
+
+class AdaptiveConcurrencyLimiter:
+    """In-flight limit tuned by observed p95 latency (AIMD)"""
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        target_p95_ms: float,
+        window: int = 200,
+        adjust_every: int = 50
+    ):
+        self.limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_p95_ms = target_p95_ms
+        self.adjust_every = adjust_every
+        self.in_flight = 0
+        self.p95_ms = 0.0
+        self._latencies = deque(maxlen=window)
+        self._since_adjust = 0
+
+    def try_acquire(self) -> bool:
+        if self.in_flight >= self.limit:
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency_ms: float):
+        self.in_flight -= 1
+        self._latencies.append(latency_ms)
+        self._since_adjust += 1
+        if self._since_adjust >= self.adjust_every:
+            self._since_adjust = 0
+            self._adjust()
+
+    def _adjust(self):
+        ordered = sorted(self._latencies)
+        self.p95_ms = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        if self.p95_ms > self.target_p95_ms:
+            self.limit = max(self.min_limit, int(self.limit * 0.9))
+        else:
+            self.limit = min(self.max_limit, self.limit + 1)
+
+
+class AdmissionMetrics:
+    """Counters for limiter decisions, rendered in Prometheus text format"""
+
+    def __init__(self):
+        self.decisions = {}
+
+    def count(self, route_class: str, decision: str):
+        key = (route_class, decision)
+        self.decisions[key] = self.decisions.get(key, 0) + 1
+
+    def render(self, limiters: dict) -> str:
+        lines = [
+            "# HELP admission_decisions_total Requests by admission decision",
+            "# TYPE admission_decisions_total counter",
+        ]
+        for (route_class, decision), count in sorted(self.decisions.items()):
+            lines.append(
+                f'admission_decisions_total{{route_class="{route_class}",decision="{decision}"}} {count}')
+
+        gauges = [
+            ("admission_concurrency_limit", "limit", "{}"),
+            ("admission_in_flight", "in_flight", "{}"),
+            ("admission_latency_p95_ms", "p95_ms", "{:.1f}"),
+        ]
+        for name, attribute, fmt in gauges:
+            lines.append(f"# TYPE {name} gauge")
+            for route_class, limiter in limiters.items():
+                value = fmt.format(getattr(limiter, attribute))
+                lines.append(f'{name}{{route_class="{route_class}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+rate_limiter = TokenBucketLimiter(
+    rate_per_second=settings.RATE_LIMIT_PER_MINUTE / 60,
+    burst=settings.RATE_LIMIT_BURST
+)
+concurrency_limiters = {
+    "default": AdaptiveConcurrencyLimiter(
+        initial_limit=settings.ADMISSION_MAX_CONCURRENCY,
+        min_limit=settings.ADMISSION_MIN_CONCURRENCY,
+        max_limit=settings.ADMISSION_MAX_CONCURRENCY,
+        target_p95_ms=settings.ADMISSION_TARGET_P95_MS
+    ),
+    "auth": AdaptiveConcurrencyLimiter(
+        initial_limit=settings.ADMISSION_AUTH_MAX_CONCURRENCY,
+        min_limit=settings.ADMISSION_MIN_CONCURRENCY,
+        max_limit=settings.ADMISSION_AUTH_MAX_CONCURRENCY,
+        target_p95_ms=settings.ADMISSION_AUTH_TARGET_P95_MS
+    ),
+    "chat": AdaptiveConcurrencyLimiter(
+        initial_limit=settings.ADMISSION_CHAT_MAX_CONCURRENCY,
+        min_limit=settings.ADMISSION_MIN_CONCURRENCY,
+        max_limit=settings.ADMISSION_CHAT_MAX_CONCURRENCY,
+        target_p95_ms=settings.ADMISSION_CHAT_TARGET_P95_MS
+    ),
+}
+admission_metrics = AdmissionMetrics()
+
+
+def render_metrics() -> str:
+    """Current limiter metrics in Prometheus text format"""
+    return admission_metrics.render(concurrency_limiters)
+
+
+def route_class(method: str, path: str) -> str:
+    """Group requests with similar cost: 'chat', 'auth' or 'default'"""
+    if method == "POST" and path.endswith("/messages"):
+        return "chat"
+    if path.startswith("/auth/"):
+        return "auth"
+    return "default"
+
+
+def admit(key: str, route: str) -> Tuple[Optional[int], float]:
+    """
+    Run the admission checks for one request or chat turn.
+
+    Returns (None, 0) when admitted; the caller must then call release().
+    Otherwise returns the status to reject with (429 or 503) and the
+    number of seconds the client should wait.
+    """
+    retry_after = rate_limiter.acquire(key)
+    if retry_after:
+        admission_metrics.count(route, "rate_limited")
+        return 429, retry_after
+
+    if not concurrency_limiters[route].try_acquire():
+        admission_metrics.count(route, "overloaded")
+        return 503, 1.0
+
+    admission_metrics.count(route, "admitted")
+    return None, 0.0
+
+
+def release(route: str, started_at: float):
+    """Free the slot taken by admit(); started_at is a time.perf_counter() value"""
+    concurrency_limiters[route].release((time.perf_counter() - started_at) * 1000)
+
+
+def retry_after_header(retry_after: float) -> str:
+    return str(max(1, math.ceil(retry_after)))
+
+
+def _client_key(scope) -> str:
+    """Rate-limit key: the token's user if present, else the client address"""
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                email: Optional[str] = decode_access_token(token)
+                if email:
+                    return f"user:{email}"
+            break
+
+    client = scope.get("client")
+    return f"ip:{client[0]}" if client else "ip:unknown"
+
+
+REJECT_DETAILS = {
+    429: "Too many requests",
+    503: "Server is busy, please retry",
+}
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware applying the rate and concurrency limits to HTTP requests.
+
+    WebSocket connections pass through here; router.ws_router applies the
+    same limits on connect and to every chat turn.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS \
+                or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        route = route_class(scope["method"], scope["path"])
+        rejected, retry_after = admit(_client_key(scope), route)
+        if rejected:
+            response = JSONResponse(
+                status_code=rejected,
+                content={"detail": REJECT_DETAILS[rejected]},
+                headers={"Retry-After": retry_after_header(retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            release(route, start)
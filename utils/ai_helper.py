@@ -2,11 +2,15 @@
 AI Response Generation
 Replace this mock implementation with actual AI integration
 """
+from typing import Iterator, List, Optional
 
 
-def generate_ai_response(user_message: str) -> str:
+def generate_ai_response(user_message: str, memories: Optional[List[str]] = None) -> str:
     """
     Generate AI response to user message
+
+    memories holds related messages from the user's earlier conversations,
+    to be given to the model as context.
     
     Replace this with:
     - OpenAI API
@@ -34,6 +38,19 @@ def generate_ai_response(user_message: str) -> str:
     return f"I understand you said: '{user_message}'. This is a mock response. In production, this would be replaced with an actual AI model."
 
 
+def stream_ai_response(user_message: str, memories: Optional[List[str]] = None) -> Iterator[str]:
+    """
+    Generate AI response to user message as a stream of text chunks
+
+    Replace this with the streaming variant of the chosen API
+    (e.g. stream=True for OpenAI or messages.stream for Anthropic).
+    """
+    response = generate_ai_response(user_message, memories)
+    words = response.split(" ")
+    for i, word in enumerate(words):
+        yield word if i == 0 else " " + word
+
+
 # Example: OpenAI Integration (uncomment and configure to use)
 """
 import openai
@@ -41,8 +58,14 @@ from app.config import settings
 
 openai.api_key = settings.OPENAI_API_KEY
 
-def generate_ai_response_openai(user_message: str, conversation_history: list = None) -> str:
+def generate_ai_response_openai(user_message: str, conversation_history: list = None, memories: list = None) -> str:
     messages = [{"role": "system", "content": "You are a helpful assistant."}]
+
+    if memories:
+        messages.append({
+            "role": "system",
+            "content": "Relevant messages from earlier conversations:\n" + "\n".join(memories)
+        })
     
     if conversation_history:
         messages.extend(conversation_history)
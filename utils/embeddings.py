@@ -0,0 +1,37 @@
+"""
+Text embedding helper backed by the OpenAI embeddings API
+"""
+from typing import List
+import requests
+from config import settings
+
+OPENAI_EMBEDDINGS_URL = "https://api.openai.com/v1/embeddings"
+
+
+def embed_texts(texts: List[str], timeout: float = 30) -> List[List[float]]:
+    """Embed a batch of texts in a single request, preserving order"""
+    if not texts:
+        return []
+
+    response = requests.post(
+        OPENAI_EMBEDDINGS_URL,
+        headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"},
+        json={"model": settings.EMBEDDING_MODEL, "input": texts},
+        timeout=timeout
+    )
+    response.raise_for_status()
+
+    data = sorted(response.json()["data"], key=lambda item: item["index"])
+    return [item["embedding"] for item in data]
+
+
+def embed_text(text: str, timeout: float = 30) -> List[float]:
+    """Embed a single text"""
+    return embed_texts([text], timeout)[0]
+
+
+def is_input_error(exc: Exception) -> bool:
+    """True if the API rejected the input itself rather than failing to serve it"""
+    response = getattr(exc, "response", None)
+    return isinstance(exc, requests.HTTPError) and response is not None \
+        and response.status_code in (400, 413, 422)
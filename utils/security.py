@@ -1,3 +1,5 @@
+import hashlib
+import secrets
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
@@ -36,10 +38,32 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 def decode_access_token(token: str) -> Optional[str]:
     """Decode a JWT access token"""
+    payload = decode_access_token_claims(token)
+    if payload is None:
+        return None
+    email: str = payload.get("sub")
+    return email
+
+
+def decode_access_token_claims(token: str) -> Optional[dict]:
+    """Decode a JWT access token and return all of its claims"""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY,
-                             algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        return email
+        return jwt.decode(token, settings.SECRET_KEY,
+                          algorithms=[settings.ALGORITHM])
     except JWTError:
         return None
+
+
+def create_refresh_token() -> str:
+    """Create an opaque, URL-safe refresh token"""
+    return secrets.token_urlsafe(32)
+
+
+def hash_refresh_token(token: str) -> str:
+    """
+    Hash a refresh token for storage.
+
+    Refresh tokens are 256 bits of randomness, so a single SHA-256 is enough;
+    unlike passwords they gain nothing from a slow hash like bcrypt.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()